@@ -1,25 +1,451 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+import json
+import atexit
+from typing import Any
+import uuid
+import shelve
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import httpx
+import hishel
+import faiss
+import lmdb
+import orjson
+import numpy as np
+from openai import OpenAI, AsyncOpenAI, RateLimitError
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+from selectolax.parser import HTMLParser
 from dotenv import load_dotenv
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
+from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain.chains import ConversationalRetrievalChain
-from langchain.schema.runnable import RunnablePassthrough
-from langchain.schema.output_parser import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain.memory import ConversationBufferMemory
 from langchain.schema import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.embeddings import Embeddings
 
 load_dotenv()
 
+def _orjson_response(response):
+    """Decode JSON response bodies with orjson instead of the stdlib json module"""
+    response.json = lambda **kwargs: orjson.loads(response.content)
+
+async def _aorjson_response(response):
+    _orjson_response(response)
+
+# Shared keep-alive pool so every embedding and completion call reuses warm connections
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_http = httpx.Client(
+    http2=True,
+    limits=_HTTP_LIMITS,
+    timeout=30.0,
+    event_hooks={"response": [_orjson_response]}
+)
+
+def _openai(api_key, base_url=None):
+    """Sync OpenAI client on the shared pool; LangChain still builds its own async client"""
+    return OpenAI(api_key=api_key, base_url=base_url, http_client=_http)
+
+# Worker processes for CPU-bound parsing and splitting, started on first use and kept across loads
+_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+_PARALLEL_SPLIT_MIN_DOCS = 8
+
+def _parse_html(content):
+    """Extract title and plain text from an HTML page"""
+    tree = HTMLParser(content)
+    
+    for tag in tree.css("script, style"):
+        tag.decompose()
+    
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) if title_node else ""
+    root = tree.body or tree.root
+    text = ' '.join(root.text(separator=' ').split()) if root else ""
+    return title or "LangChain Documentation", text
+
+async def _embed_batch(semaphore, client, model, batch):
+    """Embed one batch, backing off and retrying when rate limited"""
+    async with semaphore:
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception_type(RateLimitError),
+            wait=wait_exponential_jitter(),
+            stop=stop_after_attempt(6),
+            reraise=True
+        ):
+            with attempt:
+                response = await client.embeddings.create(model=model, input=batch)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+class SemanticCache:
+    """Answer cache keyed on query embeddings, matched by cosine similarity"""
+
+    # Writes are batched: a put schedules one snapshot this many seconds later
+    SAVE_DELAY = 5.0
+
+    def __init__(self, path, threshold=0.95, max_entries=1024):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.vectors = None
+        self.payloads = []
+        self.last_used = []
+        self._clock = 0
+        # Streamlit serves sessions from several script threads sharing this cache
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._dirty = False
+        self.load()
+        atexit.register(self.save)
+
+    @staticmethod
+    def _normalize(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _match(self, query):
+        """Index of the closest cached query at or above the threshold, else None"""
+        if self.vectors is None or self.vectors.shape[1] != query.shape[0]:
+            return None
+        
+        scores = self.vectors @ query
+        best = int(np.argmax(scores))
+        return best if scores[best] >= self.threshold else None
+
+    def get(self, vector):
+        """Return the payload of the closest cached query, or None below the threshold"""
+        query = self._normalize(vector)
+        
+        with self._lock:
+            best = self._match(query)
+            if best is None:
+                return None
+            
+            self._clock += 1
+            self.last_used[best] = self._clock
+            return self.payloads[best]
+
+    def _put(self, query, payload):
+        """Insert or update an entry in memory; the caller holds the lock"""
+        if self.vectors is not None and self.vectors.shape[1] != query.shape[0]:
+            self.clear()
+        
+        self._clock += 1
+        self._dirty = True
+        
+        # Fill in a matching entry (e.g. a seeded placeholder) rather than duplicating it
+        best = self._match(query)
+        if best is not None:
+            self.payloads[best] = payload
+            self.last_used[best] = self._clock
+            return
+        
+        if len(self.payloads) >= self.max_entries:
+            oldest = int(np.argmin(self.last_used))
+            self.vectors = np.delete(self.vectors, oldest, axis=0)
+            del self.payloads[oldest]
+            del self.last_used[oldest]
+        
+        self.vectors = query[None, :] if self.vectors is None else np.vstack([self.vectors, query])
+        self.payloads.append(payload)
+        self.last_used.append(self._clock)
+
+    def put(self, vector, payload):
+        """Cache a payload for a query, evicting the least recently used entry when full"""
+        query = self._normalize(vector)
+        
+        with self._lock:
+            self._put(query, payload)
+            
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def seed(self, vectors):
+        """Add placeholder entries for expected queries not yet in the cache"""
+        with self._lock:
+            for vector in vectors:
+                query = self._normalize(vector)
+                if self._match(query) is None:
+                    self._put(query, None)
+        
+        self.save()
+
+    def clear(self):
+        self.vectors = None
+        self.payloads = []
+        self.last_used = []
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        
+        try:
+            with np.load(self.path) as data:
+                self.vectors = data["vectors"].astype(np.float32)
+                self.payloads = [json.loads(payload) for payload in data["payloads"]]
+                self.last_used = data["last_used"].tolist()
+            self._clock = max(self.last_used, default=0)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable semantic cache: {str(e)}")
+            self.clear()
+
+    def save(self):
+        """Write a snapshot to disk if anything changed, doing the I/O outside the cache lock"""
+        with self._save_lock:
+            with self._lock:
+                self._save_timer = None
+                if not self._dirty or self.vectors is None:
+                    return
+                
+                # Arrays are replaced rather than mutated and payloads are never edited
+                # in place, so shallow copies are a consistent snapshot
+                vectors = self.vectors
+                payloads = list(self.payloads)
+                last_used = list(self.last_used)
+                self._dirty = False
+            
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = self.path + ".tmp.npz"
+                np.savez(
+                    tmp_path,
+                    vectors=vectors,
+                    payloads=np.array([json.dumps(payload) for payload in payloads]),
+                    last_used=np.array(last_used)
+                )
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"⚠️ Could not save semantic cache: {str(e)}")
+                with self._lock:
+                    self._dirty = True
+
+class EmbeddingCache:
+    """Content-addressed store of fp16 embedding vectors backed by LMDB"""
+
+    def __init__(self, path, namespace):
+        self.env = lmdb.open(path, map_size=2 << 30)
+        self.namespace = namespace.encode()
+
+    def _key(self, text):
+        return hashlib.sha256(self.namespace + b"\0" + text.encode()).digest()
+
+    def get_many(self, texts):
+        """Return cached vectors in order, with None for each miss"""
+        with self.env.begin() as txn:
+            raw = [txn.get(self._key(text)) for text in texts]
+        return [None if value is None else np.frombuffer(value, dtype=np.float16).astype(np.float32).tolist() for value in raw]
+
+    def put_many(self, texts, vectors):
+        with self.env.begin(write=True) as txn:
+            for text, vector in zip(texts, vectors):
+                txn.put(self._key(text), np.asarray(vector, dtype=np.float16).tobytes())
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends cache misses to the underlying model"""
+
+    def __init__(self, base, cache):
+        self.base = base
+        self.cache = cache
+
+    def embed_documents(self, texts):
+        vectors = self.cache.get_many(texts)
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        
+        if misses:
+            miss_texts = [texts[i] for i in misses]
+            miss_vectors = self.base.embed_documents(miss_texts)
+            self.cache.put_many(miss_texts, miss_vectors)
+            for i, vector in zip(misses, miss_vectors):
+                vectors[i] = vector
+        
+        return vectors
+
+    def embed_query(self, text):
+        vector = self.cache.get_many([text])[0]
+        if vector is None:
+            vector = self.base.embed_query(text)
+            self.cache.put_many([text], [vector])
+        return vector
+
+class VectorRetriever(BaseRetriever):
+    """LangChain retriever over any store exposing search(query, k)"""
+
+    store: Any
+    k: int = 4
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        return self.store.search(query, self.k)
+
+def _save_documents(path, documents):
+    with open(path, "w") as f:
+        json.dump([{"page_content": doc.page_content, "metadata": doc.metadata} for doc in documents], f)
+
+def _load_documents(path):
+    with open(path) as f:
+        return [Document(**doc) for doc in json.load(f)]
+
+class FAISSVectorStore:
+    """In-memory FAISS inner-product index over L2-normalised embeddings"""
+
+    INDEX_FILE = "index.faiss"
+    DOCUMENTS_FILE = "documents.json"
+
+    def __init__(self, embeddings, index, documents):
+        self.embeddings = embeddings
+        self.index = index
+        self.documents = documents
+
+    @classmethod
+    def from_embeddings(cls, embeddings, documents, vectors, index_type="flat"):
+        matrix = np.asarray(vectors, dtype=np.float32)
+        faiss.normalize_L2(matrix)
+        
+        if index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(matrix.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+        elif index_type in ("sq8", "fp16"):
+            # Scalar quantization: 1 or 2 bytes per dimension instead of 4
+            quantizer_type = faiss.ScalarQuantizer.QT_8bit_uniform if index_type == "sq8" else faiss.ScalarQuantizer.QT_fp16
+            index = faiss.IndexScalarQuantizer(matrix.shape[1], quantizer_type, faiss.METRIC_INNER_PRODUCT)
+            index.train(matrix)
+        else:
+            index = faiss.IndexFlatIP(matrix.shape[1])
+        
+        index.add(matrix)
+        return cls(embeddings, index, list(documents))
+
+    @classmethod
+    def exists(cls, path):
+        return os.path.exists(os.path.join(path, cls.INDEX_FILE))
+
+    @classmethod
+    def load(cls, embeddings, path):
+        index = faiss.read_index(os.path.join(path, cls.INDEX_FILE))
+        return cls(embeddings, index, _load_documents(os.path.join(path, cls.DOCUMENTS_FILE)))
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        faiss.write_index(self.index, os.path.join(path, self.INDEX_FILE))
+        _save_documents(os.path.join(path, self.DOCUMENTS_FILE), self.documents)
+
+    def search(self, query, k=4):
+        """Return the k documents closest to the query by cosine similarity"""
+        query_vector = np.asarray([self.embeddings.embed_query(query)], dtype=np.float32)
+        faiss.normalize_L2(query_vector)
+        _, ids = self.index.search(query_vector, k)
+        return [self.documents[i] for i in ids[0] if i != -1]
+
+    def as_retriever(self, search_type="similarity", search_kwargs=None):
+        return VectorRetriever(store=self, k=(search_kwargs or {}).get("k", 4))
+
+class NumpyVectorStore:
+    """Exact cosine search as one matrix-vector product, for corpora small enough to skip an index"""
+
+    MATRIX_FILE = "embeddings.npy"
+    DOCUMENTS_FILE = "documents.json"
+
+    def __init__(self, embeddings, matrix, documents):
+        self.embeddings = embeddings
+        self.matrix = matrix
+        self.documents = documents
+
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    @classmethod
+    def from_embeddings(cls, embeddings, documents, vectors):
+        matrix = cls._normalize(np.asarray(vectors, dtype=np.float32))
+        return cls(embeddings, np.ascontiguousarray(matrix), list(documents))
+
+    @classmethod
+    def exists(cls, path):
+        return os.path.exists(os.path.join(path, cls.MATRIX_FILE))
+
+    @classmethod
+    def load(cls, embeddings, path):
+        matrix = np.load(os.path.join(path, cls.MATRIX_FILE))
+        return cls(embeddings, matrix, _load_documents(os.path.join(path, cls.DOCUMENTS_FILE)))
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, self.MATRIX_FILE), self.matrix)
+        _save_documents(os.path.join(path, self.DOCUMENTS_FILE), self.documents)
+
+    def search(self, query, k=4):
+        """Return the k documents closest to the query by cosine similarity"""
+        k = min(k, len(self.documents))
+        if k <= 0:
+            return []
+        
+        query_vector = self._normalize(np.asarray(self.embeddings.embed_query(query), dtype=np.float32))
+        scores = self.matrix @ query_vector
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self.documents[i] for i in top]
+
+    def as_retriever(self, search_type="similarity", search_kwargs=None):
+        return VectorRetriever(store=self, k=(search_kwargs or {}).get("k", 4))
+
+SAMPLE_QUESTIONS = [
+    "What is LangChain?",
+    "How do I create a vector store?",
+    "What are document loaders?",
+    "How does conversational memory work?",
+    "What is the difference between chains and agents?"
+]
+
 class LangChainChatbot:
     def __init__(self):
-        self.embeddings = OpenAIEmbeddings(
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-            openai_api_base=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+        self.embedding_provider = os.getenv("EMBEDDING_PROVIDER", "openai")
+        
+        if self.embedding_provider == "huggingface":
+            # Local sentence-transformers model: no API round trip per query
+            import torch
+            
+            self.embedding_model = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+            self.embeddings = HuggingFaceEmbeddings(
+                model_name=self.embedding_model,
+                model_kwargs={"device": "cuda" if torch.cuda.is_available() else "cpu"},
+                encode_kwargs={"batch_size": 64, "normalize_embeddings": True}
+            )
+        elif self.embedding_provider == "infinity":
+            # Infinity sidecar serving an OpenAI-compatible /embeddings endpoint
+            self.embedding_model = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+            self.embedding_api_key = os.getenv("INFINITY_API_KEY", "infinity")
+            self.embedding_base_url = os.getenv("INFINITY_BASE_URL", "http://localhost:7997")
+            self.embeddings = OpenAIEmbeddings(
+                model=self.embedding_model,
+                openai_api_key=self.embedding_api_key,
+                openai_api_base=self.embedding_base_url,
+                check_embedding_ctx_length=False,
+                client=_openai(self.embedding_api_key, self.embedding_base_url).embeddings
+            )
+        else:
+            self.embedding_model = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
+            self.embedding_api_key = os.getenv("OPENAI_API_KEY")
+            self.embedding_base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+            self.embeddings = OpenAIEmbeddings(
+                model=self.embedding_model,
+                openai_api_key=self.embedding_api_key,
+                openai_api_base=self.embedding_base_url,
+                client=_openai(self.embedding_api_key, self.embedding_base_url).embeddings
+            )
+        
+        # Identical strings are only ever embedded once per model
+        self.embedding_cache = EmbeddingCache(
+            os.getenv("EMBED_CACHE_PATH", "./embed_cache.lmdb"),
+            f"{self.embedding_provider}:{self.embedding_model}"
         )
+        self.embeddings = CachedEmbeddings(self.embeddings, self.embedding_cache)
         
         if os.getenv("E2E_LLM_ENDPOINT"):
             # Try common E2E model names
@@ -28,27 +454,49 @@ class LangChainChatbot:
                 openai_api_key=os.getenv("E2E_API_KEY"),
                 openai_api_base=os.getenv("E2E_LLM_ENDPOINT"),
                 model_name=model_name,
-                temperature=0.7
+                temperature=0.7,
+                streaming=True,
+                client=_openai(os.getenv("E2E_API_KEY"), os.getenv("E2E_LLM_ENDPOINT")).chat.completions
             )
         else:
             self.llm = ChatOpenAI(
                 openai_api_key=os.getenv("OPENAI_API_KEY"),
                 model_name="gpt-3.5-turbo",
-                temperature=0.7
+                temperature=0.7,
+                streaming=True,
+                client=_openai(os.getenv("OPENAI_API_KEY")).chat.completions
             )
         
+        self.chunk_size = int(os.getenv("CHUNK_SIZE", 1000))
+        self.chunk_overlap = int(os.getenv("CHUNK_OVERLAP", 200))
         self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=int(os.getenv("CHUNK_SIZE", 1000)),
-            chunk_overlap=int(os.getenv("CHUNK_OVERLAP", 200))
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap
         )
+        self.split_cache_path = os.getenv("SPLIT_CACHE_PATH", "./split_cache")
         
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
+        self.http_cache_path = os.getenv("HTTP_CACHE_PATH", "./http_cache")
+        
+        self.embed_batch_size = int(os.getenv("EMBED_BATCH_SIZE", 512))
+        self.embed_concurrency = int(os.getenv("EMBED_CONCURRENCY", 8))
+        
+        self.memory = self.new_memory()
+        
+        self.semantic_cache = SemanticCache(
+            os.path.join(os.getenv("VECTOR_STORE_PATH", "./chroma_db"), "semantic_cache.npz"),
+            threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95))
         )
         
+        self.vector_store_backend = os.getenv("VECTOR_STORE_BACKEND", "chroma")
         self.vector_store = None
-        self.chat_chain = None
+        self.retriever = None
+
+    def new_memory(self):
+        """Create conversation memory for one user session"""
+        return ConversationBufferMemory(
+            memory_key="chat_history",
+            return_messages=True
+        )
 
     def load_langchain_docs(self):
         """Load LangChain documentation"""
@@ -67,59 +515,182 @@ class LangChainChatbot:
         ]
         
         documents = []
+        results = asyncio.run(self._fetch_all(docs_urls))
         
-        for url in docs_urls:
-            try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                content = soup.get_text()
-                content = ' '.join(content.split())
-                
-                if len(content) > 200:
-                    doc = Document(
-                        page_content=content,
-                        metadata={
-                            "source": url,
-                            "title": soup.title.string if soup.title else "LangChain Documentation"
-                        }
-                    )
-                    documents.append(doc)
-                    print(f"✅ Loaded: {url}")
-                
-            except Exception as e:
-                print(f"❌ Error loading {url}: {str(e)}")
+        for url, result in zip(docs_urls, results):
+            if isinstance(result, Exception):
+                print(f"❌ Error loading {url}: {str(result)}")
                 continue
+            
+            title, content = result
+            if len(content) > 200:
+                doc = Document(
+                    page_content=content,
+                    metadata={
+                        "source": url,
+                        "title": title
+                    }
+                )
+                documents.append(doc)
+                print(f"✅ Loaded: {url}")
         
         print(f"📖 Successfully loaded {len(documents)} documents")
         return documents
 
+    async def _fetch_all(self, urls):
+        """Fetch all URLs concurrently over one pooled, disk-cached client, parsing pages as they arrive"""
+        loop = asyncio.get_running_loop()
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+        
+        # Responses are revalidated with ETag/Last-Modified and kept for a day;
+        # parsed text is keyed by content hash so unchanged pages skip parsing too
+        os.makedirs(self.http_cache_path, exist_ok=True)
+        storage = hishel.AsyncFileStorage(base_path=Path(self.http_cache_path) / "responses", ttl=86400)
+        
+        with shelve.open(os.path.join(self.http_cache_path, "parsed")) as parsed_cache:
+            async with hishel.AsyncCacheClient(
+                storage=storage,
+                limits=limits,
+                timeout=10.0,
+                http2=True,
+                follow_redirects=True
+            ) as client:
+                async def fetch(url):
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    
+                    # Parser name in the key so switching parsers invalidates old output
+                    key = f"selectolax:{hashlib.sha256(response.content).hexdigest()}"
+                    if key not in parsed_cache:
+                        parsed_cache[key] = await loop.run_in_executor(_pool, _parse_html, response.content)
+                    return parsed_cache[key]
+                
+                return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+
     def setup_vector_store(self, documents):
         """Create and setup vector store"""
         print("🔍 Setting up vector store...")
         
-        texts = self.text_splitter.split_documents(documents)
+        texts = self._split_documents(documents)
         print(f"📄 Split into {len(texts)} chunks")
         
         vector_store_path = os.getenv("VECTOR_STORE_PATH", "./chroma_db")
         collection_name = os.getenv("COLLECTION_NAME", "langchain_docs")
         
-        self.vector_store = Chroma.from_documents(
-            documents=texts,
-            embedding=self.embeddings,
-            persist_directory=vector_store_path,
-            collection_name=collection_name
-        )
+        vectors = asyncio.run(self._embed_texts([text.page_content for text in texts]))
+        print(f"🧮 Embedded {len(vectors)} chunks")
+        
+        if self.vector_store_backend == "faiss":
+            self.vector_store = FAISSVectorStore.from_embeddings(
+                self.embeddings,
+                texts,
+                vectors,
+                index_type=os.getenv("FAISS_INDEX_TYPE", "flat")
+            )
+            self.vector_store.save(vector_store_path)
+        elif self.vector_store_backend == "numpy":
+            self.vector_store = NumpyVectorStore.from_embeddings(self.embeddings, texts, vectors)
+            self.vector_store.save(vector_store_path)
+        else:
+            self.vector_store = Chroma(
+                persist_directory=vector_store_path,
+                embedding_function=self.embeddings,
+                collection_name=collection_name
+            )
+            
+            for start in range(0, len(texts), self.embed_batch_size):
+                batch = texts[start:start + self.embed_batch_size]
+                self.vector_store._collection.add(
+                    ids=[str(uuid.uuid4()) for _ in batch],
+                    embeddings=vectors[start:start + self.embed_batch_size],
+                    metadatas=[text.metadata for text in batch],
+                    documents=[text.page_content for text in batch]
+                )
         
         print("✅ Vector store created!")
 
+    def _split_documents(self, documents):
+        """Split documents into chunks, reusing cached splits and splitting misses across processes"""
+        keys = [
+            hashlib.blake2b(
+                f"{self.chunk_size}:{self.chunk_overlap}:{doc.page_content}".encode(),
+                digest_size=16
+            ).hexdigest()
+            for doc in documents
+        ]
+        texts = []
+        
+        with shelve.open(self.split_cache_path) as split_cache:
+            misses = {key: doc.page_content for key, doc in zip(keys, documents) if key not in split_cache}
+            
+            # Process startup only pays off once there are enough documents to spread out
+            if len(misses) >= _PARALLEL_SPLIT_MIN_DOCS:
+                chunked = _pool.map(self.text_splitter.split_text, misses.values())
+            else:
+                chunked = map(self.text_splitter.split_text, misses.values())
+            
+            for key, chunks in zip(misses, chunked):
+                split_cache[key] = chunks
+            
+            for key, doc in zip(keys, documents):
+                texts.extend(
+                    Document(page_content=chunk, metadata=dict(doc.metadata))
+                    for chunk in split_cache[key]
+                )
+        
+        return texts
+
+    async def _embed_texts(self, texts):
+        """Embed texts for ingest, sending only chunks missing from the embedding cache"""
+        vectors = self.embedding_cache.get_many(texts)
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        print(f"🗃️ {len(texts) - len(misses)} of {len(texts)} chunk embeddings found in cache")
+        
+        if misses:
+            miss_texts = [texts[i] for i in misses]
+            miss_vectors = await self._embed_uncached(miss_texts)
+            self.embedding_cache.put_many(miss_texts, miss_vectors)
+            for i, vector in zip(misses, miss_vectors):
+                vectors[i] = vector
+        
+        return vectors
+
+    async def _embed_uncached(self, texts):
+        """Embed texts in large batches, bounding concurrent API requests with a semaphore"""
+        if self.embedding_provider == "huggingface":
+            # One batched forward pass over the whole corpus
+            vectors = self.embeddings.base.client.encode(
+                texts,
+                batch_size=64,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            return vectors.tolist()
+        
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+        batches = [texts[start:start + self.embed_batch_size] for start in range(0, len(texts), self.embed_batch_size)]
+        
+        # Async clients are bound to their event loop, so the pool lives for one ingest run
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=_HTTP_LIMITS,
+            timeout=30.0,
+            event_hooks={"response": [_aorjson_response]}
+        )
+        async with AsyncOpenAI(
+            api_key=self.embedding_api_key,
+            base_url=self.embedding_base_url,
+            http_client=http_client
+        ) as client:
+            results = await asyncio.gather(
+                *(_embed_batch(semaphore, client, self.embedding_model, batch) for batch in batches)
+            )
+        
+        return [vector for batch in results for vector in batch]
+
     def setup_chat_chain(self):
-        """Setup conversational retrieval chain"""
+        """Setup retriever and prompt for the single-call answer path"""
         print("🤖 Setting up chat chain...")
         
         self.retriever = self.vector_store.as_retriever(
@@ -145,7 +716,12 @@ class LangChainChatbot:
             # Check if vector store already exists
             vector_store_path = os.getenv("VECTOR_STORE_PATH", "./chroma_db")
             
-            if os.path.exists(vector_store_path):
+            local_store = {"faiss": FAISSVectorStore, "numpy": NumpyVectorStore}.get(self.vector_store_backend)
+            
+            if local_store is not None and local_store.exists(vector_store_path):
+                print(f"📂 Loading existing {self.vector_store_backend} vector store...")
+                self.vector_store = local_store.load(self.embeddings, vector_store_path)
+            elif local_store is None and os.path.exists(os.path.join(vector_store_path, "chroma.sqlite3")):
                 print("📂 Loading existing vector store...")
                 self.vector_store = Chroma(
                     persist_directory=vector_store_path,
@@ -158,55 +734,80 @@ class LangChainChatbot:
                 self.setup_vector_store(documents)
             
             self.setup_chat_chain()
+            
+            # Warm the embedding cache for the sidebar questions and reserve their answer slots
+            try:
+                self._sample_vecs = self.embeddings.embed_documents(SAMPLE_QUESTIONS)
+                self.semantic_cache.seed(self._sample_vecs)
+            except Exception as e:
+                print(f"⚠️ Skipping sample question warm-up: {str(e)}")
+            
             return True
             
         except Exception as e:
             print(f"❌ Initialization error: {str(e)}")
             return False
 
-    def chat(self, message):
-        """Chat with the bot"""
+    def chat_stream(self, message, memory=None):
+        """Chat with the bot, returning a stream of answer tokens and the source documents"""
+        if memory is None:
+            memory = self.memory
+        
         if not self.retriever:
-            return "❌ System not initialized. Please restart the application."
+            return iter(["❌ System not initialized. Please restart the application."]), []
         
         try:
+            # Near-duplicate questions are answered straight from the cache
+            query_vector = self.embeddings.embed_query(message)
+            cached = self.semantic_cache.get(query_vector)
+            
+            if isinstance(cached, dict):
+                memory.save_context({"input": message}, {"output": cached["answer"]})
+                return iter([cached["answer"]]), cached["sources"]
+            
             # Get relevant documents
             docs = self.retriever.get_relevant_documents(message)
             context = "\n\n".join([doc.page_content for doc in docs])
+            sources = [
+                {
+                    "url": doc.metadata.get("source", "Unknown"),
+                    "title": doc.metadata.get("title", "LangChain Docs")
+                }
+                for doc in docs
+            ]
             
             # Format the prompt
             formatted_prompt = self.prompt.format(context=context, question=message)
             
-            # Get response from LLM
-            response = self.llm.invoke(formatted_prompt)
-            
-            # Store in memory
-            self.memory.chat_memory.add_user_message(message)
-            self.memory.chat_memory.add_ai_message(response.content)
-            
-            return response.content
+            return self._stream_answer(message, query_vector, formatted_prompt, sources, memory), sources
             
         except Exception as e:
-            return f"❌ Error: {str(e)}"
+            return iter([f"❌ Error: {str(e)}"]), []
 
-    def get_sources(self, message):
-        """Get source documents for a query"""
-        if not self.retriever:
-            return []
+    def _stream_answer(self, message, query_vector, formatted_prompt, sources, memory):
+        """Yield LLM tokens as they arrive, then cache and remember the full answer"""
+        chunks = []
         
         try:
-            docs = self.retriever.get_relevant_documents(message)
-            sources = []
-            for doc in docs:
-                sources.append({
-                    "url": doc.metadata.get("source", "Unknown"),
-                    "title": doc.metadata.get("title", "LangChain Docs")
-                })
-            return sources
-        except:
-            return []
+            for chunk in self.llm.stream(formatted_prompt):
+                chunks.append(chunk.content)
+                yield chunk.content
+        except Exception as e:
+            yield f"❌ Error: {str(e)}"
+            return
+        
+        answer = "".join(chunks)
+        self.semantic_cache.put(query_vector, {"answer": answer, "sources": sources})
+        
+        # Store in memory
+        memory.save_context({"input": message}, {"output": answer})
+
+    def chat(self, message, memory=None):
+        """Chat with the bot, returning the answer and its source documents"""
+        stream, sources = self.chat_stream(message, memory)
+        return "".join(stream), sources
 
-    def clear_memory(self):
+    def clear_memory(self, memory=None):
         """Clear conversation memory"""
-        self.memory.clear()
+        (self.memory if memory is None else memory).clear()
         return "🧹 Conversation history cleared!"
\ No newline at end of file
@@ -1,6 +1,6 @@
 import streamlit as st
 import os
-from rag_backend import LangChainChatbot
+from rag_backend import LangChainChatbot, SAMPLE_QUESTIONS
 
 # Page configuration
 st.set_page_config(
@@ -39,18 +39,25 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource(show_spinner="🚀 Initializing LangChain Documentation Chatbot...")
+def get_chatbot():
+    """Build the chatbot once per process; conversation memory stays per session"""
+    chatbot = LangChainChatbot()
+    if not chatbot.initialize():
+        # Raising keeps the failure out of the cache so the next rerun retries
+        raise RuntimeError("Chatbot initialization failed")
+    return chatbot
+
 def initialize_chatbot():
     """Initialize the chatbot"""
-    if 'chatbot' not in st.session_state:
-        with st.spinner("🚀 Initializing LangChain Documentation Chatbot..."):
-            chatbot = LangChainChatbot()
-            success = chatbot.initialize()
-            if success:
-                st.session_state.chatbot = chatbot
-                st.success("✅ Chatbot initialized successfully!")
-            else:
-                st.error("❌ Failed to initialize chatbot. Please check your configuration.")
-                return False
+    try:
+        chatbot = get_chatbot()
+    except RuntimeError:
+        st.error("❌ Failed to initialize chatbot. Please check your configuration.")
+        return False
+    
+    if 'memory' not in st.session_state:
+        st.session_state.memory = chatbot.new_memory()
     return True
 
 def display_message(message, is_user=True):
@@ -99,20 +106,12 @@ def main():
         if st.button("🧹 Clear Conversation", type="secondary"):
             if 'messages' in st.session_state:
                 st.session_state.messages = []
-            if 'chatbot' in st.session_state:
-                st.session_state.chatbot.clear_memory()
+            if 'memory' in st.session_state:
+                st.session_state.memory.clear()
             st.rerun()
         
         st.header("💡 Sample Questions")
-        sample_questions = [
-            "What is LangChain?",
-            "How do I create a vector store?",
-            "What are document loaders?",
-            "How does conversational memory work?",
-            "What is the difference between chains and agents?"
-        ]
-        
-        for question in sample_questions:
+        for question in SAMPLE_QUESTIONS:
             if st.button(f"💬 {question}", key=f"sample_{question}"):
                 st.session_state.current_question = question
 
@@ -154,26 +153,25 @@ def main():
         st.session_state.messages.append({"role": "user", "content": prompt})
         display_message(prompt, True)
 
-        # Get bot response
-        with st.spinner("🤔 Thinking..."):
-            try:
-                response = st.session_state.chatbot.chat(prompt)
-                
-                # Add assistant response to chat history
-                st.session_state.messages.append({"role": "assistant", "content": response})
-                display_message(response, False)
-                
-                # Show sources
-                sources = st.session_state.chatbot.get_sources(prompt)
-                if sources:
-                    with st.expander("📚 Sources", expanded=False):
-                        for i, source in enumerate(sources[:3], 1):
-                            st.markdown(f"{i}. [{source['title']}]({source['url']})")
-                
-            except Exception as e:
-                error_msg = f"❌ Error: {str(e)}"
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
-                display_message(error_msg, False)
+        # Get bot response, streaming tokens as they arrive
+        try:
+            with st.spinner("🤔 Thinking..."):
+                stream, sources = get_chatbot().chat_stream(prompt, st.session_state.memory)
+            response = st.write_stream(stream)
+            
+            # Add assistant response to chat history
+            st.session_state.messages.append({"role": "assistant", "content": response})
+            
+            # Show sources
+            if sources:
+                with st.expander("📚 Sources", expanded=False):
+                    for i, source in enumerate(sources[:3], 1):
+                        st.markdown(f"{i}. [{source['title']}]({source['url']})")
+            
+        except Exception as e:
+            error_msg = f"❌ Error: {str(e)}"
+            st.session_state.messages.append({"role": "assistant", "content": error_msg})
+            display_message(error_msg, False)
 
         # Rerun to show the new messages
         st.rerun()